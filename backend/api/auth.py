@@ -1,13 +1,17 @@
 """
 Authentication API - HuggingFace Token Management
 """
+import asyncio
+import hashlib
 import os
+import time
 from pathlib import Path
 from typing import Optional
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from huggingface_hub import HfApi, hf_hub_download
-from huggingface_hub.utils import HfHubHTTPError
+
+# huggingface_hub (and its requests/fsspec/tqdm dependency tree) is imported
+# lazily inside the handlers so uvicorn startup doesn't pay for it
 
 router = APIRouter()
 
@@ -16,6 +20,50 @@ BACKEND_DIR = Path(__file__).parent.parent
 TOKEN_FILE = BACKEND_DIR / ".hf_token"
 CHECKPOINTS_DIR = BACKEND_DIR / "checkpoints"
 
+# Cache HfApi clients and whoami results so a status-page refresh doesn't
+# cost a fresh HTTPS round-trip every time (keyed by token hash)
+WHOAMI_TTL = 300  # seconds
+
+_hf_api_cache = {}  # token hash -> HfApi
+_whoami_cache = {}  # token hash -> (expires_at, user_info)
+_model_check_cache = {"mtime": -1.0, "present": False}
+
+MODEL_FILE_SUFFIXES = (".safetensors", ".bin")
+
+
+def _token_key(token: str) -> str:
+    """Short stable hash of a token, safe to use as a cache key"""
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+
+def get_hf_api(token: str):
+    """Get a cached HfApi client for this token (keeps TCP/TLS warm)"""
+    from huggingface_hub import HfApi
+
+    key = _token_key(token)
+    api = _hf_api_cache.get(key)
+    if api is None:
+        api = HfApi(token=token)
+        _hf_api_cache[key] = api
+    return api
+
+
+async def cached_whoami(token: str) -> dict:
+    """Validate a token via whoami, cached with a TTL
+
+    The blocking HTTP call runs in a thread so it doesn't stall the
+    event loop; raises on invalid tokens (failures are not cached).
+    """
+    key = _token_key(token)
+    cached = _whoami_cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    api = get_hf_api(token)
+    user_info = await asyncio.to_thread(api.whoami)
+    _whoami_cache[key] = (time.monotonic() + WHOAMI_TTL, user_info)
+    return user_info
+
 
 class TokenRequest(BaseModel):
     token: str
@@ -39,11 +87,29 @@ def save_token(token: str):
 
 
 def check_model_downloaded() -> bool:
-    """Check if SAM Audio model is downloaded"""
-    # Check for common model files
-    model_files = list(CHECKPOINTS_DIR.glob("*.safetensors")) + \
-                  list(CHECKPOINTS_DIR.glob("*.bin"))
-    return len(model_files) > 0
+    """Check if SAM Audio model is downloaded
+
+    The directory is only rescanned when its mtime changes, so the steady
+    state for the frequently-polled /status endpoint is one os.stat call
+    instead of two full directory globs.
+    """
+    try:
+        st = os.stat(CHECKPOINTS_DIR)
+    except FileNotFoundError:
+        return False
+
+    if st.st_mtime == _model_check_cache["mtime"]:
+        return _model_check_cache["present"]
+
+    # Check for common model files (short-circuits on the first match)
+    present = any(
+        entry.name.endswith(MODEL_FILE_SUFFIXES)
+        for entry in CHECKPOINTS_DIR.iterdir()
+    )
+
+    _model_check_cache["mtime"] = st.st_mtime
+    _model_check_cache["present"] = present
+    return present
 
 
 @router.get("/status", response_model=AuthStatus)
@@ -51,11 +117,10 @@ async def get_auth_status():
     """Check authentication and model status"""
     token = get_saved_token()
     authenticated = False
-    
+
     if token:
         try:
-            api = HfApi(token=token)
-            api.whoami()
+            await cached_whoami(token)
             authenticated = True
         except Exception:
             authenticated = False
@@ -70,14 +135,18 @@ async def get_auth_status():
 @router.post("/login")
 async def login(request: TokenRequest):
     """Validate and save HuggingFace token"""
+    from huggingface_hub.utils import HfHubHTTPError
+
     try:
         # Validate token
-        api = HfApi(token=request.token)
-        user_info = api.whoami()
-        
+        user_info = await cached_whoami(request.token)
+        api = get_hf_api(request.token)
+
         # Check if user has access to SAM Audio
         try:
-            api.model_info("facebook/sam-audio-large", token=request.token)
+            await asyncio.to_thread(
+                api.model_info, "facebook/sam-audio-large", token=request.token
+            )
         except HfHubHTTPError as e:
             if "403" in str(e) or "401" in str(e):
                 raise HTTPException(
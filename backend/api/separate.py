@@ -1,12 +1,19 @@
 """
 Separation API - Audio/Video Separation Endpoints
 """
+import asyncio
+import hashlib
+import os
 import uuid
 from pathlib import Path
 from typing import Optional, List
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+import aiofiles
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request
 from pydantic import BaseModel
 
+from celery import group
+
+from api.tasks import record_task_metadata, record_tasks_metadata
 from workers.celery_app import celery_app
 from workers.tasks import separate_audio_task
 
@@ -14,18 +21,118 @@ router = APIRouter()
 
 UPLOAD_DIR = Path("uploads")
 
-# Supported MIME types
-AUDIO_TYPES = ["audio/mpeg", "audio/wav", "audio/mp3", "audio/x-wav", "audio/flac", "audio/m4a", "audio/aac"]
-VIDEO_TYPES = ["video/mp4", "video/webm", "video/quicktime", "video/x-msvideo", "video/mpeg", "video/x-matroska"]
-VIDEO_EXTENSIONS = [".mp4", ".webm", ".mov", ".avi", ".mkv", ".mpeg"]
+# Content-addressed store: identical uploads share one copy via hardlinks
+BY_HASH_DIR = UPLOAD_DIR / "by-hash"
+BY_HASH_DIR.mkdir(parents=True, exist_ok=True)
+
+# Supported MIME types (frozensets: O(1) membership on the request path)
+AUDIO_TYPES = frozenset({"audio/mpeg", "audio/wav", "audio/mp3", "audio/x-wav", "audio/flac", "audio/m4a", "audio/aac"})
+VIDEO_TYPES = frozenset({"video/mp4", "video/webm", "video/quicktime", "video/x-msvideo", "video/mpeg", "video/x-matroska"})
+VIDEO_EXTENSIONS = frozenset({".mp4", ".webm", ".mov", ".avi", ".mkv", ".mpeg"})
+
+# Upload chunk size (1 MB) - keeps large uploads out of RAM
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Magic-byte prefixes for the media containers we accept
+# RIFF (wav/avi), ID3 (mp3), fLaC, OggS, EBML (webm/mkv), FORM (aiff)
+MEDIA_MAGIC_PREFIXES = (b"RIFF", b"ID3", b"fLaC", b"OggS", b"\x1aE\xdf\xa3", b"FORM")
+
+
+def looks_like_media(header: bytes) -> bool:
+    """Sniff the first bytes of an upload for a known audio/video signature"""
+    if header.startswith(MEDIA_MAGIC_PREFIXES):
+        return True
+    # ISO base media (mp4/mov/m4a): 'ftyp' at offset 4
+    if len(header) >= 8 and header[4:8] == b"ftyp":
+        return True
+    # Raw MPEG audio frame sync (mp3/aac without ID3 header)
+    if len(header) >= 2 and header[0] == 0xFF and (header[1] & 0xE0) == 0xE0:
+        return True
+    return False
+
+
+async def validate_media_upload(file: UploadFile):
+    """Reject non-media uploads from the first 16 bytes, before spooling"""
+    header = await file.read(16)
+    await file.seek(0)
+    if not looks_like_media(header):
+        raise HTTPException(
+            status_code=415,
+            detail="File does not look like a supported audio/video format"
+        )
 
 
-class SeparationRequest(BaseModel):
-    description: str
-    mode: str = "extract"  # "extract" or "remove"
-    start_time: Optional[float] = None
-    end_time: Optional[float] = None
-    model_size: str = "base"  # "small", "base", "large"
+def _sendfile_copy(file: UploadFile, upload_path: Path):
+    """Zero-copy the spooled upload to disk via sendfile(2) (Linux/macOS)"""
+    spooled = file.file
+    if hasattr(spooled, "rollover"):
+        # Force the in-memory spool onto disk so it has a real file descriptor
+        spooled.rollover()
+    src_fd = spooled.fileno()
+    os.lseek(src_fd, 0, os.SEEK_SET)
+
+    dst_fd = os.open(upload_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        offset = 0
+        while True:
+            sent = os.sendfile(dst_fd, src_fd, offset, 1 << 22)
+            if sent == 0:
+                break
+            offset += sent
+    finally:
+        os.close(dst_fd)
+
+
+async def save_upload_file(file: UploadFile, upload_path: Path):
+    """Save an uploaded file to disk without buffering it all in RAM
+
+    Uses sendfile(2) for a kernel-side zero-copy when available (Linux/macOS),
+    otherwise falls back to a chunked async write.
+    """
+    if hasattr(os, "sendfile"):
+        try:
+            await asyncio.to_thread(_sendfile_copy, file, upload_path)
+            return
+        except OSError:
+            # Non-regular source fd (e.g. EINVAL) - fall back to chunked copy
+            await file.seek(0)
+
+    async with aiofiles.open(upload_path, "wb") as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await f.write(chunk)
+
+
+def _hash_file(path: Path) -> str:
+    """Compute a streaming BLAKE2b digest of a file on disk"""
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+async def dedupe_upload(upload_path: Path) -> Path:
+    """Deduplicate an upload against the content-addressed store
+
+    Identical files (common when users retry with different prompts) end up
+    as hardlinks to a single canonical copy, so they cost no extra disk.
+    Returns the canonical path to hand to the worker; on filesystems without
+    hardlink support the task-scoped path is returned unchanged.
+    """
+    digest = await asyncio.to_thread(_hash_file, upload_path)
+    canonical = BY_HASH_DIR / f"{digest}{upload_path.suffix}"
+
+    try:
+        if canonical.exists():
+            # Same content already stored - relink the task path to it
+            os.unlink(upload_path)
+            os.link(canonical, upload_path)
+        else:
+            os.link(upload_path, canonical)
+    except OSError:
+        return upload_path
+
+    return canonical
 
 
 class SeparationResponse(BaseModel):
@@ -34,8 +141,28 @@ class SeparationResponse(BaseModel):
     message: str
 
 
+class PresignResponse(BaseModel):
+    task_id: str
+    key: str
+    url: str
+    fields: dict
+
+
+# Optional object storage (MinIO/S3) - set S3_BUCKET to enable.
+# Uploads then go browser -> S3 directly and the API never sees the bytes.
+S3_BUCKET = os.environ.get("S3_BUCKET")
+S3_ENDPOINT_URL = os.environ.get("S3_ENDPOINT_URL")  # e.g. http://minio:9000
+MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_BYTES", 2 * 1024**3))
+
+
+def _s3_client():
+    import boto3  # Optional dependency, only needed when S3_BUCKET is set
+    return boto3.client("s3", endpoint_url=S3_ENDPOINT_URL)
+
+
 @router.post("/", response_model=SeparationResponse)
 async def create_separation_task(
+    request: Request,
     file: UploadFile = File(...),
     description: str = Form(...),
     mode: str = Form("extract"),
@@ -58,30 +185,30 @@ async def create_separation_task(
     - **use_float32**: Use float32 precision for better quality (default: false)
     """
     
+    await validate_media_upload(file)
+
     # Validate chunk_duration
     chunk_duration = max(5.0, min(60.0, chunk_duration))
     
     # Parse use_float32 from string to bool
     use_float32_bool = use_float32.lower() == "true"
     
-    # Detect if file is video
-    file_extension = Path(file.filename).suffix.lower() if file.filename else ""
+    # Detect if file is video (build the Path once)
+    file_extension = Path(file.filename).suffix if file.filename else ""
     is_video = (
         (file.content_type and file.content_type in VIDEO_TYPES) or
-        file_extension in VIDEO_EXTENSIONS
+        file_extension.lower() in VIDEO_EXTENSIONS
     )
-    
+
     # Generate task ID
     task_id = str(uuid.uuid4())
-    
+
     # Save uploaded file
-    file_extension = Path(file.filename).suffix or ".mp3"
-    upload_path = UPLOAD_DIR / f"{task_id}{file_extension}"
-    
-    with open(upload_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
-    
+    upload_path = UPLOAD_DIR / f"{task_id}{file_extension or '.mp3'}"
+
+    await save_upload_file(file, upload_path)
+    canonical_path = await dedupe_upload(upload_path)
+
     # Build anchors for temporal prompting
     anchors = None
     if start_time is not None and end_time is not None:
@@ -90,7 +217,7 @@ async def create_separation_task(
     # Submit Celery task
     celery_task = separate_audio_task.apply_async(
         args=[
-            str(upload_path),
+            str(canonical_path),
             description,
             mode,
             anchors,
@@ -101,7 +228,100 @@ async def create_separation_task(
         ],
         task_id=task_id
     )
-    
+
+    # Index the task for the recent-tasks listing
+    await record_task_metadata(request.app.state.redis, task_id, description, mode)
+
+    return SeparationResponse(
+        task_id=task_id,
+        status="pending",
+        message="Task submitted successfully"
+    )
+
+
+@router.post("/presign", response_model=PresignResponse)
+async def presign_upload(filename: str = Form(...)):
+    """
+    Get a presigned POST so the browser uploads straight to object storage
+
+    Only available when S3_BUCKET is configured. The returned key is then
+    submitted to POST /api/separate/from-key instead of uploading the file
+    through this API.
+    """
+    if not S3_BUCKET:
+        raise HTTPException(status_code=501, detail="Object storage is not configured")
+
+    task_id = str(uuid.uuid4())
+    file_extension = Path(filename).suffix or ".mp3"
+    key = f"uploads/{task_id}{file_extension}"
+
+    s3 = _s3_client()
+    presigned = await asyncio.to_thread(
+        s3.generate_presigned_post,
+        S3_BUCKET,
+        key,
+        Conditions=[["content-length-range", 1, MAX_UPLOAD_BYTES]],
+        ExpiresIn=3600
+    )
+
+    return PresignResponse(
+        task_id=task_id,
+        key=key,
+        url=presigned["url"],
+        fields=presigned["fields"]
+    )
+
+
+@router.post("/from-key", response_model=SeparationResponse)
+async def create_separation_from_key(
+    request: Request,
+    key: str = Form(...),
+    description: str = Form(...),
+    mode: str = Form("extract"),
+    start_time: Optional[float] = Form(None),
+    end_time: Optional[float] = Form(None),
+    model_size: str = Form("base"),
+    chunk_duration: float = Form(25.0),
+    use_float32: str = Form("false")
+):
+    """
+    Create a separation task for a file already uploaded to object storage
+
+    Companion to POST /api/separate/presign - the worker pulls the input
+    from S3 itself, so the API process never touches the file bytes.
+    """
+    if not S3_BUCKET:
+        raise HTTPException(status_code=501, detail="Object storage is not configured")
+
+    chunk_duration = max(5.0, min(60.0, chunk_duration))
+    use_float32_bool = use_float32.lower() == "true"
+
+    file_extension = Path(key).suffix.lower()
+    is_video = file_extension in VIDEO_EXTENSIONS
+
+    # Task id was minted by /presign and embedded in the key
+    task_id = Path(key).stem
+
+    anchors = None
+    if start_time is not None and end_time is not None:
+        anchors = [[["+", start_time, end_time]]]
+
+    separate_audio_task.apply_async(
+        args=[
+            f"s3://{S3_BUCKET}/{key}",
+            description,
+            mode,
+            anchors,
+            model_size,
+            chunk_duration,
+            use_float32_bool,
+            is_video
+        ],
+        task_id=task_id
+    )
+
+    await record_task_metadata(request.app.state.redis, task_id, description, mode)
+
     return SeparationResponse(
         task_id=task_id,
         status="pending",
@@ -111,6 +331,7 @@ async def create_separation_task(
 
 @router.post("/batch", response_model=List[SeparationResponse])
 async def create_batch_separation(
+    request: Request,
     file: UploadFile = File(...),
     descriptions: str = Form(...),  # JSON array of descriptions
     mode: str = Form("extract")
@@ -125,29 +346,39 @@ async def create_batch_separation(
         desc_list = json.loads(descriptions)
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid descriptions format")
+
+    await validate_media_upload(file)
     
     # Save file once
     base_task_id = str(uuid.uuid4())
     file_extension = Path(file.filename).suffix or ".mp3"
     upload_path = UPLOAD_DIR / f"{base_task_id}{file_extension}"
-    
-    with open(upload_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
-    
-    responses = []
-    for i, desc in enumerate(desc_list):
-        task_id = f"{base_task_id}-{i}"
-        
-        separate_audio_task.apply_async(
-            args=[str(upload_path), desc, mode, None, "small"],
-            task_id=task_id
-        )
-        
-        responses.append(SeparationResponse(
+
+    await save_upload_file(file, upload_path)
+    canonical_path = await dedupe_upload(upload_path)
+
+    # Fan out all tasks in a single group publish instead of N round-trips,
+    # holding one broker connection from the producer pool for the duration
+    task_ids = [f"{base_task_id}-{i}" for i in range(len(desc_list))]
+    with celery_app.producer_pool.acquire(block=True) as producer:
+        group(
+            separate_audio_task.s(
+                str(canonical_path), desc, mode, None, "small"
+            ).set(task_id=task_id)
+            for task_id, desc in zip(task_ids, desc_list)
+        ).apply_async(producer=producer)
+
+    # Index all children in one MULTI/EXEC block
+    await record_tasks_metadata(
+        request.app.state.redis,
+        [(task_id, desc, mode) for task_id, desc in zip(task_ids, desc_list)]
+    )
+
+    return [
+        SeparationResponse(
             task_id=task_id,
             status="pending",
             message=f"Task for '{desc}' submitted"
-        ))
-    
-    return responses
+        )
+        for task_id, desc in zip(task_ids, desc_list)
+    ]
@@ -1,12 +1,13 @@
 """
 Tasks API - Task Status and Results
 """
+import os
+import time
 from pathlib import Path
 from typing import Optional, List
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
-from celery.result import AsyncResult
 
 from workers.celery_app import celery_app
 
@@ -14,6 +15,43 @@ router = APIRouter()
 
 OUTPUT_DIR = Path("outputs")
 
+# Redis index for the recent-tasks listing
+RECENT_TASKS_KEY = "tasks:recent"
+RECENT_TASKS_MAX = 1000
+# Metadata hashes expire with the Celery result (result_expires=86400)
+TASK_META_TTL = 86400
+
+# When enabled, downloads are offloaded to the reverse proxy via
+# X-Accel-Redirect (nginx: location /_internal/outputs/ { internal;
+# alias .../outputs/; sendfile on; }) so Python never streams the bytes
+USE_XACCEL = os.getenv("USE_XACCEL") == "1"
+
+VIDEO_MEDIA_TYPES = {
+    ".mp4": "video/mp4",
+    ".webm": "video/webm",
+    ".mov": "video/quicktime",
+    ".avi": "video/x-msvideo",
+    ".mkv": "video/x-matroska"
+}
+
+
+def file_download_response(file_path: Path, filename: str, media_type: str):
+    """Serve an output file, offloading to the reverse proxy when enabled"""
+    if USE_XACCEL:
+        try:
+            relative = file_path.relative_to(OUTPUT_DIR)
+        except ValueError:
+            relative = None
+
+        if relative is not None:
+            return Response(headers={
+                "X-Accel-Redirect": f"/_internal/outputs/{relative.as_posix()}",
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                "Content-Type": media_type
+            })
+
+    return FileResponse(path=file_path, filename=filename, media_type=media_type)
+
 
 class TaskStatus(BaseModel):
     task_id: str
@@ -21,116 +59,251 @@ class TaskStatus(BaseModel):
     progress: int  # 0-100
     message: Optional[str] = None
     result: Optional[dict] = None
+    description: Optional[str] = None
+    mode: Optional[str] = None
 
 
-class TaskResult(BaseModel):
-    original_url: str
-    ghost_url: str  # Separated target
-    clean_url: str  # Residual
+async def _trim_recent_tasks(redis_client):
+    """Trim the recency index and delete metadata for trimmed entries
 
+    A blind ZREMRANGEBYRANK would leave the tasks:meta hashes of trimmed
+    members behind forever, so the overflow members are fetched first.
+    """
+    overflow = await redis_client.zrange(
+        RECENT_TASKS_KEY, 0, -(RECENT_TASKS_MAX + 1)
+    )
+    if not overflow:
+        return
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.zrem(RECENT_TASKS_KEY, *overflow)
+    for member in overflow:
+        task_id = member.decode() if isinstance(member, bytes) else member
+        pipe.delete(f"tasks:meta:{task_id}")
+    await pipe.execute()
 
-@router.get("/{task_id}", response_model=TaskStatus)
-async def get_task_status(task_id: str):
-    """Get the status of a separation task"""
-    
-    result = AsyncResult(task_id, app=celery_app)
-    
-    if result.state == "PENDING":
+
+async def record_task_metadata(redis_client, task_id: str, description: str, mode: str):
+    """Index a submitted task for the recent-tasks listing (one pipelined RTT)"""
+    now = time.time()
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.zadd(RECENT_TASKS_KEY, {task_id: now})
+    pipe.hset(
+        f"tasks:meta:{task_id}",
+        mapping={"description": description, "mode": mode, "created": now}
+    )
+    pipe.expire(f"tasks:meta:{task_id}", TASK_META_TTL)
+    await pipe.execute()
+    # Keep the index bounded (and the trimmed hashes with it)
+    await _trim_recent_tasks(redis_client)
+
+
+async def record_tasks_metadata(redis_client, entries):
+    """Index several submitted tasks in one MULTI/EXEC round-trip
+
+    entries: iterable of (task_id, description, mode) tuples
+    """
+    now = time.time()
+    pipe = redis_client.pipeline(transaction=True)
+    for task_id, description, mode in entries:
+        pipe.zadd(RECENT_TASKS_KEY, {task_id: now})
+        pipe.hset(
+            f"tasks:meta:{task_id}",
+            mapping={"description": description, "mode": mode, "created": now}
+        )
+        pipe.expire(f"tasks:meta:{task_id}", TASK_META_TTL)
+    await pipe.execute()
+    await _trim_recent_tasks(redis_client)
+
+
+def status_from_backend_meta(task_id: str, meta: Optional[dict]) -> TaskStatus:
+    """Build a TaskStatus from a raw Celery result-backend entry"""
+
+    if meta is None:
         return TaskStatus(
             task_id=task_id,
             status="pending",
             progress=0,
             message="Task is waiting to be processed"
         )
-    
-    elif result.state == "PROGRESS":
-        info = result.info or {}
+
+    state = meta.get("status", "PENDING")
+
+    if state == "PROGRESS":
+        info = meta.get("result") or {}
         return TaskStatus(
             task_id=task_id,
             status="processing",
             progress=info.get("progress", 0),
             message=info.get("message", "Processing...")
         )
-    
-    elif result.state == "SUCCESS":
+
+    elif state == "SUCCESS":
         return TaskStatus(
             task_id=task_id,
             status="completed",
             progress=100,
             message="Task completed successfully",
-            result=result.result
+            result=meta.get("result")
         )
-    
-    elif result.state == "FAILURE":
+
+    elif state == "FAILURE":
         return TaskStatus(
             task_id=task_id,
             status="failed",
             progress=0,
-            message=str(result.info)
-        )
-    
-    else:
-        return TaskStatus(
-            task_id=task_id,
-            status=result.state.lower(),
-            progress=0,
-            message=f"Task state: {result.state}"
+            message=str(meta.get("result"))
         )
 
+    return TaskStatus(
+        task_id=task_id,
+        status=state.lower(),
+        progress=0,
+        message=f"Task state: {state}"
+    )
+
+
+async def fetch_task_status(redis_client, task_id: str) -> TaskStatus:
+    """Read task status from Redis over the shared async pool
+
+    Bypasses Celery's synchronous AsyncResult (which would block the
+    event loop) - one async GET plus a backend decode.
+    """
+    raw = await redis_client.get(f"celery-task-meta-{task_id}")
+    meta = celery_app.backend.decode(raw) if raw is not None else None
+    return status_from_backend_meta(task_id, meta)
+
+
+@router.get("/{task_id}", response_model=TaskStatus)
+async def get_task_status(task_id: str, request: Request):
+    """Get the status of a separation task"""
+
+    return await fetch_task_status(request.app.state.redis, task_id)
+
+
+@router.get("/{task_id}/events")
+async def stream_task_events(task_id: str, request: Request):
+    """
+    Stream task status updates over Server-Sent Events
+
+    Pushes a TaskStatus JSON event whenever the Celery result backend key
+    changes (via Redis keyspace notifications), so the frontend gets
+    O(state-transitions) updates instead of polling every 500ms.
+    The polling endpoint above remains available as a fallback.
+    """
+
+    redis_client = request.app.state.redis
+    # The keyspace channel carries the db index of the configured URL -
+    # hardcoding 0 would silently subscribe to nothing on other dbs
+    db = redis_client.connection_pool.connection_kwargs.get("db", 0)
+    channel = f"__keyspace@{db}__:celery-task-meta-{task_id}"
+
+    async def event_stream():
+        pubsub = redis_client.pubsub()
+        await pubsub.subscribe(channel)
+
+        try:
+            # Send the current state first so fast tasks aren't missed
+            status = await fetch_task_status(redis_client, task_id)
+            yield f"data: {status.model_dump_json()}\n\n"
+
+            while status.status not in ("completed", "failed"):
+                if await request.is_disconnected():
+                    break
+
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=30.0
+                )
+                if message is None:
+                    # Keyspace notifications may be unavailable (managed
+                    # Redis rejecting CONFIG SET - see main.py), so the
+                    # timeout degrades to a 30s poll instead of hanging
+                    # forever; the comment line keeps proxies from
+                    # reaping the idle connection
+                    previous = status
+                    status = await fetch_task_status(redis_client, task_id)
+                    if status != previous:
+                        yield f"data: {status.model_dump_json()}\n\n"
+                    else:
+                        yield ": keep-alive\n\n"
+                    continue
+
+                status = await fetch_task_status(redis_client, task_id)
+                yield f"data: {status.model_dump_json()}\n\n"
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
 
 @router.get("/{task_id}/download/{file_type}")
-async def download_result(task_id: str, file_type: str):
+async def download_result(task_id: str, file_type: str, request: Request):
     """
     Download processed audio or video file
-    
+
     - **file_type**: "original", "ghost", "clean", or "video"
     """
-    
+
     if file_type not in ["original", "ghost", "clean", "video"]:
         raise HTTPException(status_code=400, detail="Invalid file type")
-    
+
+    # Fast path: the output naming scheme is deterministic, so a finished
+    # file can be resolved with a stat plus one async status GET. The
+    # completion gate matters: outputs are written under their final
+    # names mid-task (the video copy lands at task start), so a filename
+    # hit alone could serve a premature or truncated file.
+    status = await fetch_task_status(request.app.state.redis, task_id)
+    if status.status == "completed":
+        if file_type == "video":
+            matches = sorted(OUTPUT_DIR.glob(f"{task_id}.video.*"))
+            if matches:
+                file_path = matches[0]
+                extension = file_path.suffix.lower()
+                return file_download_response(
+                    file_path,
+                    f"{task_id}_video{extension}",
+                    VIDEO_MEDIA_TYPES.get(extension, "video/mp4")
+                )
+        else:
+            file_path = OUTPUT_DIR / f"{task_id}.{file_type}.wav"
+            if file_path.exists():
+                return file_download_response(
+                    file_path, f"{task_id}_{file_type}.wav", "audio/wav"
+                )
+
+    # Fallback: resolve via the result backend (legacy/non-standard paths)
+    from celery.result import AsyncResult
+
     result = AsyncResult(task_id, app=celery_app)
-    
+
     if result.state != "SUCCESS":
         raise HTTPException(status_code=404, detail="Task not completed")
-    
+
     # Handle video file separately
     if file_type == "video":
         video_path = result.result.get("video_path")
         if not video_path:
             raise HTTPException(status_code=404, detail="No video file for this task")
-        
+
         file_path = Path(video_path)
         if not file_path.exists():
             raise HTTPException(status_code=404, detail="Video file not found")
-        
-        # Determine media type based on extension
+
         extension = file_path.suffix.lower()
-        media_types = {
-            ".mp4": "video/mp4",
-            ".webm": "video/webm",
-            ".mov": "video/quicktime",
-            ".avi": "video/x-msvideo",
-            ".mkv": "video/x-matroska"
-        }
-        media_type = media_types.get(extension, "video/mp4")
-        
-        return FileResponse(
-            path=file_path,
-            filename=f"{task_id}_video{extension}",
-            media_type=media_type
+        return file_download_response(
+            file_path,
+            f"{task_id}_video{extension}",
+            VIDEO_MEDIA_TYPES.get(extension, "video/mp4")
         )
-    
+
     # Handle audio files
     file_path = Path(result.result.get(f"{file_type}_path", ""))
-    
+
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="File not found")
-    
-    return FileResponse(
-        path=file_path,
-        filename=f"{task_id}_{file_type}.wav",
-        media_type="audio/wav"
+
+    return file_download_response(
+        file_path, f"{task_id}_{file_type}.wav", "audio/wav"
     )
 
 
@@ -138,6 +311,8 @@ async def download_result(task_id: str, file_type: str):
 async def cancel_task(task_id: str):
     """Cancel a pending or running task"""
     
+    from celery.result import AsyncResult
+
     result = AsyncResult(task_id, app=celery_app)
     result.revoke(terminate=True)
     
@@ -145,9 +320,33 @@ async def cancel_task(task_id: str):
 
 
 @router.get("/", response_model=List[TaskStatus])
-async def list_recent_tasks(limit: int = 10):
-    """List recent tasks (simplified - in production would use database)"""
-    # Note: This is a simplified implementation
-    # In production, you would store task metadata in a database
-    
-    return []
+async def list_recent_tasks(request: Request, limit: int = 10):
+    """List recent tasks from the Redis-backed index"""
+
+    redis_client = request.app.state.redis
+
+    task_ids = await redis_client.zrevrange(RECENT_TASKS_KEY, 0, limit - 1)
+    if not task_ids:
+        return []
+
+    # One pipelined round-trip for all backend entries and their metadata
+    pipe = redis_client.pipeline(transaction=False)
+    for task_id in task_ids:
+        pipe.get(f"celery-task-meta-{task_id.decode()}")
+        pipe.hgetall(f"tasks:meta:{task_id.decode()}")
+    replies = await pipe.execute()
+
+    statuses = []
+    for i, task_id in enumerate(task_ids):
+        raw, meta_hash = replies[2 * i], replies[2 * i + 1]
+        # backend.decode honours the configured result serializer (msgpack)
+        meta = celery_app.backend.decode(raw) if raw is not None else None
+        status = status_from_backend_meta(task_id.decode(), meta)
+        if meta_hash:
+            description = meta_hash.get(b"description")
+            mode = meta_hash.get(b"mode")
+            status.description = description.decode() if description else None
+            status.mode = mode.decode() if mode else None
+        statuses.append(status)
+
+    return statuses
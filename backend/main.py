@@ -2,9 +2,12 @@
 AudioGhost AI - FastAPI Backend
 """
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
+import redis.asyncio as aioredis
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from api import auth, separate, tasks
@@ -18,10 +21,43 @@ UPLOAD_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
 CHECKPOINTS_DIR.mkdir(exist_ok=True)
 
+# Match the Celery app: use the Unix socket when Redis is co-located
+REDIS_SOCKET = os.environ.get("REDIS_SOCKET", "/run/redis/redis.sock")
+
+if os.path.exists(REDIS_SOCKET):
+    REDIS_URL = f"unix://{REDIS_SOCKET}?db=0"
+else:
+    REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+
+# Reject oversized uploads before the body is read (default 2 GB)
+MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_BYTES", 2 * 1024**3))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared async Redis pool (status reads + pub-sub for task events)
+    app.state.redis = aioredis.from_url(REDIS_URL, max_connections=64)
+
+    # Keyspace notifications drive the /api/tasks/{id}/events SSE endpoint
+    try:
+        await app.state.redis.config_set("notify-keyspace-events", "KEA")
+    except Exception:
+        # Managed Redis may disallow CONFIG SET - SSE falls back to polling
+        pass
+
+    yield
+
+    await app.state.redis.aclose()
+
+
 app = FastAPI(
     title="AudioGhost AI",
     description="AI-Powered Audio Separation Tool",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    # orjson serializes the frequently-polled status responses 2-10x
+    # faster than the default json encoder
+    default_response_class=ORJSONResponse
 )
 
 # CORS Configuration
@@ -33,6 +69,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def max_body_size(request, call_next):
+    """Return 413 from the Content-Length header alone, before reading the body"""
+    content_length = request.headers.get("content-length")
+    if content_length and int(content_length) > MAX_UPLOAD_BYTES:
+        from fastapi.responses import JSONResponse
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"Upload too large (max {MAX_UPLOAD_BYTES} bytes)"}
+        )
+    return await call_next(request)
+
+
 # Mount static files for downloads
 app.mount("/outputs", StaticFiles(directory="outputs"), name="outputs")
 
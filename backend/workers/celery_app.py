@@ -1,24 +1,58 @@
 """
 Celery Application Configuration
 """
+import os
+
 from celery import Celery
 
+# Prefer a Unix socket when Redis is co-located (skips the TCP loopback
+# stack for every broker/result message); fall back to TCP otherwise
+REDIS_SOCKET = os.environ.get("REDIS_SOCKET", "/run/redis/redis.sock")
+
+if os.path.exists(REDIS_SOCKET):
+    _redis_url = f"redis+socket://{REDIS_SOCKET}?virtual_host=0"
+else:
+    _redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+
 celery_app = Celery(
     "audioghost",
-    broker="redis://localhost:6379/0",
-    backend="redis://localhost:6379/0",
+    broker=_redis_url,
+    backend=_redis_url,
     include=["workers.tasks"]
 )
 
 # Celery Configuration
 celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    # msgpack messages/results are ~2-3x smaller than JSON and much
+    # cheaper to decode on the frequently-polled status path
+    task_serializer="msgpack",
+    accept_content=["msgpack", "json"],
+    result_serializer="msgpack",
+    result_accept_content=["msgpack", "json"],
     timezone="UTC",
     enable_utc=True,
     task_track_started=True,
+    # Batch items run eagerly via separate_audio_task.apply() under their
+    # own task_ids; without this, eager results never reach the backend,
+    # so those ids stay stuck at the last PROGRESS meta and the download
+    # endpoint's completion gate never opens
+    task_store_eager_result=True,
     task_time_limit=3600,  # 1 hour max per task
-    worker_prefetch_multiplier=1,  # Process one task at a time (GPU memory)
+    worker_prefetch_multiplier=1,  # Safe default for the GPU worker
+    # Two queues: GPU inference must stay serialized (prefetch=1), but
+    # lightweight I/O tasks shouldn't wait behind it. Run e.g.:
+    #   celery -A workers.celery_app worker -Q gpu --pool=solo
+    #   celery -A workers.celery_app worker -Q io --pool=threads \
+    #       --concurrency=8 --prefetch-multiplier=32
+    broker_transport_options={
+        "socket_keepalive": True,
+        "health_check_interval": 30,
+    },
+    task_default_queue="io",
+    task_routes={
+        "workers.tasks.separate_audio_task": {"queue": "gpu"},
+        "workers.tasks.separate_audio_batch_task": {"queue": "gpu"},
+        "workers.tasks.match_pattern_task": {"queue": "gpu"},
+    },
     result_expires=86400,  # Results expire after 24 hours
 )
@@ -2,6 +2,7 @@
 Celery Tasks - Audio Separation Workers
 With SAM Audio Lite optimization for low VRAM usage
 """
+import logging
 import os
 import sys
 import gc
@@ -9,6 +10,7 @@ from pathlib import Path
 from typing import Optional, List
 
 from celery import current_task
+from celery.signals import worker_process_init
 
 from workers.celery_app import celery_app
 
@@ -18,9 +20,92 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 OUTPUT_DIR = Path("outputs")
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-# Global model cache to avoid reloading
-_model_cache = {}
-_processor_cache = {}
+# Lazy %-style logging: arguments are only formatted when the level is
+# enabled, so debug lines cost nothing in production. CUDA memory-stat
+# queries are additionally gated on isEnabledFor - memory_allocated()
+# is a synchronous CUDA call and must not run when logs are discarded.
+logger = logging.getLogger(__name__)
+
+# Return cached GPU blocks to the driver only every N chunks - empty_cache
+# is a synchronous allocator call and calling it per chunk causes churn
+EMPTY_CACHE_EVERY = 8
+
+# Model loading/caching lives in sam_audio_lite (shared with the
+# standalone script); it is imported lazily inside the task so the
+# io-queue workers never pull in torch
+
+# HuggingFace token, read and logged in once per worker process - the
+# per-task login() was a disk read plus an HTTPS whoami round-trip
+_hf_token = None
+_hf_logged_in = False
+
+
+def get_hf_token() -> str:
+    """Return the saved HuggingFace token, logging in on first use"""
+    global _hf_token, _hf_logged_in
+
+    if _hf_token is None:
+        token_file = Path(__file__).parent.parent / ".hf_token"
+        if not token_file.exists():
+            raise Exception("HuggingFace token not found. Please authenticate first.")
+        _hf_token = token_file.read_text().strip()
+
+    if not _hf_logged_in:
+        from huggingface_hub import login
+        login(token=_hf_token)
+        _hf_logged_in = True
+
+    return _hf_token
+
+
+@worker_process_init.connect
+def preload_model(**kwargs):
+    """Pin the default model in GPU memory when the worker process starts
+
+    Opt-in via AUDIOGHOST_PRELOAD_MODEL=1 (set it for the gpu-queue worker
+    only) so the first task doesn't pay the multi-second model load.
+    """
+    if os.environ.get("AUDIOGHOST_PRELOAD_MODEL") != "1":
+        return
+
+    token_file = Path(__file__).parent.parent / ".hf_token"
+    if not token_file.exists():
+        logger.debug("Preload skipped: no HuggingFace token saved yet")
+        return
+
+    import torch
+    from sam_audio_lite import get_or_load_lite_model
+
+    hf_token = get_hf_token()
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    dtype = torch.bfloat16 if device == "cuda" else torch.float32
+    model_size = os.environ.get("AUDIOGHOST_DEFAULT_MODEL_SIZE", "base")
+
+    logger.debug("Preloading facebook/sam-audio-%s at worker startup...", model_size)
+    # Mirror the task's quantization default so the preloaded entry's
+    # cache key actually matches the first task's lookup
+    quantization = "int8" if os.environ.get("AUDIOGHOST_INT8") == "1" else "none"
+    get_or_load_lite_model(
+        f"facebook/sam-audio-{model_size}", hf_token, device, dtype,
+        quantization=quantization
+    )
+
+
+def fetch_s3_input(s3_uri: str) -> str:
+    """Download an s3:// input to the local uploads dir and return its path
+
+    boto3's transfer manager does concurrent ranged GETs under the hood,
+    so large videos download at NIC speed.
+    """
+    import boto3
+
+    bucket, _, key = s3_uri[len("s3://"):].partition("/")
+    local_path = Path("uploads") / Path(key).name
+    local_path.parent.mkdir(exist_ok=True)
+
+    s3 = boto3.client("s3", endpoint_url=os.environ.get("S3_ENDPOINT_URL"))
+    s3.download_file(bucket, key, str(local_path))
+    return str(local_path)
 
 
 def update_progress(progress: int, message: str):
@@ -31,131 +116,128 @@ def update_progress(progress: int, message: str):
     )
 
 
-def create_lite_model(model_name: str, hf_token: str = None):
+def pick_chunk_batch_size(device: str, start: int = 4) -> int:
+    """Choose how many chunks to stack per forward pass from free VRAM
+
+    Batch-1 chunks leave the GEMM kernels underutilized; stacking a few
+    chunks amortizes launch overhead. ~1.5GB of headroom per 25s chunk
+    is a safe empirical figure for the lite model.
     """
-    Create a memory-optimized SAM Audio model by removing unused components.
-    
-    Reduces VRAM usage from ~11GB to ~4-5GB by:
-    - Replacing vision_encoder with a dummy
-    - Disabling visual_ranker
-    - Disabling text_ranker
-    - Disabling span_predictor
+    import torch
+    if device != "cuda":
+        return 1
+    free_bytes, _ = torch.cuda.mem_get_info()
+    free_gb = free_bytes / 1024**3
+    return max(1, min(start, int(free_gb // 1.5)))
+
+
+def load_audio_mono(audio_path: str, sample_rate: int, device: str = "cpu"):
+    """Decode audio to mono at the target sample rate, shape [1, samples]
+
+    Prefers torchaudio's ffmpeg StreamReader so decode, resample and
+    downmix happen in a single ffmpeg pass instead of a CPU decode
+    followed by a separate FIR resample and mean. The fallback path
+    moves the raw decode to the GPU first, so the downmix and the
+    polyphase FIR resample run at GPU bandwidth instead of CPU.
+    """
+    import torchaudio
+
+    from sam_audio_lite import get_resampler
+
+    try:
+        from torchaudio.io import StreamReader
+
+        reader = StreamReader(audio_path)
+        reader.add_basic_audio_stream(
+            frames_per_chunk=-1, sample_rate=sample_rate, num_channels=1
+        )
+        reader.process_all_packets()
+        (chunk,) = reader.pop_chunks()
+        if chunk is not None:
+            # StreamReader yields [frames, channels]
+            return chunk.t().contiguous()
+        logger.debug("StreamReader produced no frames, falling back")
+    except Exception as e:
+        logger.debug("StreamReader decode failed (%s), falling back to torchaudio.load", e)
+
+    audio, orig_sr = torchaudio.load(audio_path)
+    if device != "cpu":
+        audio = audio.pin_memory().to(device, non_blocking=True)
+    # Downmix before resampling - halves the samples the FIR touches
+    if audio.shape[0] > 1:
+        audio = audio.mean(dim=0, keepdim=True)
+    if orig_sr != sample_rate:
+        audio = get_resampler(orig_sr, sample_rate, device)(audio)
+    return audio
+
+
+def to_int16_pcm(tensor):
+    """Convert audio to int16 PCM samples on its current device
+
+    Running this on the GPU before the D2H copy means 2 bytes/sample
+    cross PCIe instead of 4 (float32), and the host never runs a
+    full-length scale/clamp pass. The float32 intermediate keeps the
+    scaling exact for bfloat16 inputs.
     """
     import torch
-    from sam_audio import SAMAudio, SAMAudioProcessor
-    
-    print(f"Loading {model_name} (lite mode)...")
-    
-    # Load model
-    if hf_token:
-        model = SAMAudio.from_pretrained(model_name, token=hf_token)
-    else:
-        model = SAMAudio.from_pretrained(model_name)
-    
-    processor = SAMAudioProcessor.from_pretrained(model_name)
-    
-    print("Optimizing model for low VRAM...")
-    
-    # Get vision encoder dim before deleting
-    vision_dim = model.vision_encoder.dim if hasattr(model.vision_encoder, 'dim') else 1024
-    
-    # Delete heavy components
-    del model.vision_encoder
-    gc.collect()
-    
-    # Store the dim for _get_video_features
-    model._vision_encoder_dim = vision_dim
-    
-    # Replace _get_video_features to not use vision_encoder
-    def _get_video_features_lite(self, video, audio_features):
-        B, T, _ = audio_features.shape
-        return audio_features.new_zeros(B, self._vision_encoder_dim, T)
-    
-    import types
-    model._get_video_features = types.MethodType(_get_video_features_lite, model)
-    
-    # Delete rankers
-    if hasattr(model, 'visual_ranker') and model.visual_ranker is not None:
-        del model.visual_ranker
-        model.visual_ranker = None
-        gc.collect()
-    
-    if hasattr(model, 'text_ranker') and model.text_ranker is not None:
-        del model.text_ranker
-        model.text_ranker = None
-        gc.collect()
-    
-    # Delete span predictor
-    if hasattr(model, 'span_predictor') and model.span_predictor is not None:
-        del model.span_predictor
-        model.span_predictor = None
-        gc.collect()
-    
-    if hasattr(model, 'span_predictor_transform') and model.span_predictor_transform is not None:
-        del model.span_predictor_transform
-        model.span_predictor_transform = None
-        gc.collect()
-    
-    # Force garbage collection
-    gc.collect()
-    if torch.cuda.is_available():
-        torch.cuda.empty_cache()
-    
-    print("Model optimization complete!")
-    
-    return model, processor
+    return (tensor.float() * 32767.0).clamp_(-32768, 32767).to(torch.int16)
 
 
-def get_or_load_lite_model(model_name: str, hf_token: str, device: str, dtype):
-    """Get cached lite model or create it - only keeps ONE model in memory"""
+def save_wav_int16(path, tensor, sample_rate: int):
+    """Save audio as 16-bit PCM WAV
+
+    Half the bytes of a float32 WAV (faster write + download) with no
+    audible difference for separation output. Tensors that are already
+    int16 are written as-is.
+    """
     import torch
-    
-    # Include dtype in cache key to ensure correct model is loaded
-    dtype_str = "bf16" if dtype == torch.bfloat16 else "fp32"
-    cache_key = f"{model_name}_lite_{device}_{dtype_str}"
-    
-    print(f"[DEBUG] Looking for cached model with key: {cache_key}")
-    print(f"[DEBUG] Current cache keys: {list(_model_cache.keys())}")
-    
-    if cache_key not in _model_cache:
-        print(f"[DEBUG] Cache miss - creating new lite model")
-        
-        # IMPORTANT: Clear any existing models first to free memory
-        if len(_model_cache) > 0:
-            print(f"[DEBUG] Clearing {len(_model_cache)} existing model(s) from cache...")
-            for old_key in list(_model_cache.keys()):
-                del _model_cache[old_key]
-            for old_key in list(_processor_cache.keys()):
-                del _processor_cache[old_key]
-            gc.collect()
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-                print(f"[DEBUG] GPU Memory after clearing old models: {torch.cuda.memory_allocated() / 1024**3:.2f} GB")
-        
-        model, processor = create_lite_model(model_name, hf_token)
-        
-        print(f"[DEBUG] Converting model to {device} with dtype {dtype}")
-        model = model.eval().to(device, dtype)
-        
-        _model_cache[cache_key] = model
-        _processor_cache[model_name] = processor
-        
-        if torch.cuda.is_available():
-            print(f"[DEBUG] GPU Memory after loading: {torch.cuda.memory_allocated() / 1024**3:.2f} GB")
-    else:
-        print(f"[DEBUG] Cache hit - using existing model")
-    
-    return _model_cache[cache_key], _processor_cache[model_name]
+    import torchaudio
 
+    if tensor.dtype != torch.int16:
+        tensor = (tensor * 32767.0).clamp_(-32768, 32767).to(torch.int16)
+    torchaudio.save(
+        str(path), tensor, sample_rate, encoding="PCM_S", bits_per_sample=16
+    )
 
 
+def export_original(audio_path: str, original_path, audio, sample_rate: int):
+    """Produce the "original" output without a re-encode when possible
+
+    A mono WAV already at the model sample rate is byte-equivalent to
+    what we would re-save, so hardlink it (zero-copy on the same
+    filesystem, plain copy as fallback). Anything else goes through the
+    normal int16 encode of the decoded tensor.
+    """
+    import shutil
+    import torchaudio
+
+    src = Path(audio_path)
+    if src.suffix.lower() == ".wav":
+        try:
+            info = torchaudio.info(str(src))
+            if info.sample_rate == sample_rate and info.num_channels == 1:
+                if original_path.exists():
+                    original_path.unlink()
+                try:
+                    os.link(str(src), str(original_path))
+                except OSError:
+                    shutil.copy(str(src), str(original_path))
+                return
+        except Exception as e:
+            logger.debug("Could not probe %s (%s), re-encoding original", src.name, e)
+
+    save_wav_int16(original_path, audio.cpu(), sample_rate)
+
 
 def cleanup_gpu_memory():
-    """Clean up GPU memory after task"""
+    """Release cached GPU blocks back to the driver
+
+    No gc.collect() here: tensors are freed by refcounting as soon as
+    they are del'd, and a full collection walks the whole object graph.
+    """
     import torch
     if torch.cuda.is_available():
         torch.cuda.empty_cache()
-        gc.collect()
 
 
 @celery_app.task(bind=True)
@@ -168,11 +250,12 @@ def separate_audio_task(
     model_size: str = "base",
     chunk_duration: float = 25.0,
     use_float32: bool = False,
-    is_video: bool = False
+    is_video: bool = False,
+    quantization: Optional[str] = None
 ):
     """
     Separate audio using SAM Audio Lite (memory optimized)
-    
+
     Args:
         audio_path: Path to input audio or video file
         description: Text prompt for separation
@@ -182,6 +265,9 @@ def separate_audio_task(
         chunk_duration: Audio chunk duration in seconds (5-60)
         use_float32: Use float32 precision for better quality
         is_video: If True, extract audio from video file first
+        quantization: "int8" for weight-only quantized linears, "none" to
+            disable; defaults to "none" unless AUDIOGHOST_INT8=1 is set,
+            and float32 high-quality mode always runs unquantized
     
     Returns:
         Dictionary with paths to output files
@@ -191,15 +277,22 @@ def separate_audio_task(
     import time
     import subprocess
     import shutil
-    from huggingface_hub import login
-    
+    from concurrent.futures import ThreadPoolExecutor
+
+    from sam_audio_lite import get_or_load_lite_model, sdpa_flash_context
+
     task_id = self.request.id
     device = "cuda" if torch.cuda.is_available() else "cpu"
     video_path = None  # Will be set if input is video
     
     # Debug: Show received parameter
-    print(f"[DEBUG] use_float32 parameter received: {use_float32} (type: {type(use_float32).__name__})")
-    print(f"[DEBUG] is_video parameter received: {is_video}")
+    logger.debug("use_float32 parameter received: %r", use_float32)
+    logger.debug("is_video parameter received: %r", is_video)
+
+    # Inputs uploaded directly to object storage are pulled by the worker
+    if audio_path.startswith("s3://"):
+        update_progress(1, "Downloading input from object storage...")
+        audio_path = fetch_s3_input(audio_path)
     
     # Handle video files - extract audio using FFmpeg
     if is_video:
@@ -209,7 +302,7 @@ def separate_audio_task(
         # Copy video to output directory for later playback
         output_video_path = OUTPUT_DIR / f"{task_id}.video{video_path.suffix}"
         shutil.copy2(video_path, output_video_path)
-        print(f"[DEBUG] Copied video to: {output_video_path}")
+        logger.debug("Copied video to: %s", output_video_path)
         
         # Extract audio from video using FFmpeg
         extracted_audio_path = OUTPUT_DIR / f"{task_id}.extracted.wav"
@@ -230,7 +323,7 @@ def separate_audio_task(
                 text=True,
                 check=True
             )
-            print(f"[DEBUG] FFmpeg audio extraction successful")
+            logger.debug("FFmpeg audio extraction successful")
         except subprocess.CalledProcessError as e:
             raise Exception(f"FFmpeg audio extraction failed: {e.stderr}")
         
@@ -240,27 +333,31 @@ def separate_audio_task(
     # Set precision based on use_float32 parameter
     if use_float32 or device == "cpu":
         dtype = torch.float32
-        print(f"[DEBUG] Using float32 precision (High Quality Mode)")
+        logger.debug("Using float32 precision (High Quality Mode)")
     else:
         dtype = torch.bfloat16
-        print(f"[DEBUG] Using bfloat16 precision (Memory Optimized)")
+        logger.debug("Using bfloat16 precision (Memory Optimized)")
+
+    # int8 weight-only quantization is opt-in (AUDIOGHOST_INT8=1, or an
+    # explicit request parameter): in eager mode every quantized Linear
+    # re-dequantizes its full weight per forward - strictly more
+    # bandwidth than plain bf16 - and torch.compile, which would fuse
+    # the dequant, is unavailable on the primary documented platform
+    # (Windows). High-quality float32 mode always stays unquantized.
+    if quantization is None:
+        quantization = "int8" if os.environ.get("AUDIOGHOST_INT8") == "1" else "none"
+    if use_float32:
+        quantization = "none"
     
     # Start timing
     start_time = time.time()
     
     try:
         update_progress(5, "Initializing...")
-        
-        # Load HuggingFace token
-        backend_dir = Path(__file__).parent.parent
-        token_file = backend_dir / ".hf_token"
-        if token_file.exists():
-            with open(token_file, "r") as f:
-                hf_token = f.read().strip()
-            login(token=hf_token)
-        else:
-            raise Exception("HuggingFace token not found. Please authenticate first.")
-        
+
+        # Token is read and logged in once per worker process
+        hf_token = get_hf_token()
+
         # Select model based on size
         model_name = f"facebook/sam-audio-{model_size}"
         
@@ -270,26 +367,21 @@ def separate_audio_task(
         cleanup_gpu_memory()
         
         # Load lite model (with caching)
-        model, processor = get_or_load_lite_model(model_name, hf_token, device, dtype)
+        model, processor = get_or_load_lite_model(
+            model_name, hf_token, device, dtype, quantization=quantization
+        )
         
         update_progress(30, "Loading audio...")
         
         # Get sample rate
         sample_rate = processor.audio_sampling_rate
         
-        # Load and preprocess audio
-        audio, orig_sr = torchaudio.load(audio_path)
-        if orig_sr != sample_rate:
-            resampler = torchaudio.transforms.Resample(orig_sr, sample_rate)
-            audio = resampler(audio)
-        
-        # Convert to mono if stereo
-        if audio.shape[0] > 1:
-            audio = audio.mean(dim=0, keepdim=True)
-        
+        # Load and preprocess audio (decode+resample+downmix in one pass)
+        audio = load_audio_mono(audio_path, sample_rate, device)
+
         # Calculate audio duration
         audio_duration = audio.shape[1] / sample_rate
-        print(f"[DEBUG] Audio duration: {audio_duration:.2f}s")
+        logger.debug("Audio duration: %.2fs", audio_duration)
         
         # Chunking settings (from parameter, clamped to 5-60)
         CHUNK_DURATION = max(5.0, min(60.0, chunk_duration))
@@ -297,77 +389,166 @@ def separate_audio_task(
         
         # Check if chunking is needed
         if audio.shape[1] > MAX_CHUNK_SAMPLES:
-            print(f"[DEBUG] Audio is {audio_duration:.1f}s, using chunking ({CHUNK_DURATION}s chunks)")
+            logger.debug("Audio is %.1fs, using chunking (%ss chunks)", audio_duration, CHUNK_DURATION)
             
-            # Split audio into chunks
-            audio_tensor = audio.squeeze(0).to(device, dtype)
-            chunks = torch.split(audio_tensor, MAX_CHUNK_SAMPLES, dim=-1)
+            # Split audio into chunks (pinned staging buffer -> async H2D;
+            # the GPU decode fallback already has the tensor resident)
+            if device == "cuda" and audio.device.type != "cuda":
+                audio_tensor = audio.squeeze(0).pin_memory().to(
+                    device, dtype, non_blocking=True
+                )
+            else:
+                audio_tensor = audio.squeeze(0).to(device, dtype)
+            # Split into fixed-size chunks and pad the tail with zeros so
+            # every chunk shares one shape (enables stacking; the padding
+            # is trimmed from the outputs using the recorded lengths)
+            chunks = list(torch.split(audio_tensor, MAX_CHUNK_SAMPLES, dim=-1))
+            chunk_lengths = [c.shape[-1] for c in chunks]
+            if chunk_lengths[-1] < MAX_CHUNK_SAMPLES:
+                chunks[-1] = torch.nn.functional.pad(
+                    chunks[-1], (0, MAX_CHUNK_SAMPLES - chunk_lengths[-1])
+                )
             total_chunks = len(chunks)
-            
+
+            # Stack K chunks per forward pass to amortize launch overhead
+            chunk_batch = pick_chunk_batch_size(device)
+            logger.debug("Processing %d chunks, %d per forward pass", total_chunks, chunk_batch)
+
             out_target = []
             out_residual = []
-            
-            for i, chunk in enumerate(chunks):
+
+            # D2H copies go on a side stream into pinned buffers so chunk
+            # N's output migrates to host while chunk N+1 is computing
+            copy_stream = torch.cuda.Stream() if device == "cuda" else None
+            pending_copies = []  # (event, target_host, residual_host)
+
+            groups_done = 0
+            group_start = 0
+            while group_start < total_chunks:
+                group = chunks[group_start:group_start + chunk_batch]
+                lengths = chunk_lengths[group_start:group_start + chunk_batch]
+
                 # Update progress
-                chunk_progress = 30 + int((i / total_chunks) * 50)
-                update_progress(chunk_progress, f"Processing chunk {i+1}/{total_chunks}...")
-                
-                # Skip very short chunks
-                if chunk.shape[-1] < sample_rate:  # Less than 1 second
-                    print(f"[DEBUG] Skipping chunk {i+1} (too short)")
-                    continue
-                
-                # Prepare batch for this chunk
+                chunk_progress = 30 + int((group_start / total_chunks) * 50)
+                update_progress(
+                    chunk_progress,
+                    f"Processing chunks {group_start + 1}-{group_start + len(group)}/{total_chunks}..."
+                )
+
+                # Prepare one stacked batch for this group of chunks
                 batch = processor(
-                    audios=[chunk.unsqueeze(0)],
-                    descriptions=[description]
+                    audios=[c.unsqueeze(0) for c in group],
+                    descriptions=[description] * len(group)
                 ).to(device)
-                
+
                 # Run separation
-                with torch.inference_mode():
-                    with torch.cuda.amp.autocast(enabled=(device == "cuda")):
-                        result = model.separate(
-                            batch,
-                            predict_spans=False,
-                            reranking_candidates=1
-                        )
-                
-                out_target.append(result.target[0].cpu())
-                out_residual.append(result.residual[0].cpu())
-                
-                # Clean up chunk results
+                try:
+                    with torch.inference_mode():
+                        with torch.cuda.amp.autocast(enabled=(device == "cuda")):
+                            with sdpa_flash_context():
+                                result = model.separate(
+                                    batch,
+                                    predict_spans=False,
+                                    reranking_candidates=1
+                                )
+                except torch.cuda.OutOfMemoryError:
+                    if chunk_batch == 1:
+                        raise
+                    # Back off: halve the group size and retry this group
+                    chunk_batch = max(1, chunk_batch // 2)
+                    logger.warning("OOM - retrying with %d chunks per forward pass", chunk_batch)
+                    del batch
+                    torch.cuda.empty_cache()
+                    continue
+
+                for j, valid_samples in enumerate(lengths):
+                    # int16 on the device: halves the D2H traffic and
+                    # the output is already in its final PCM form
+                    target_gpu = to_int16_pcm(result.target[j][:valid_samples])
+                    residual_gpu = to_int16_pcm(result.residual[j][:valid_samples])
+
+                    if copy_stream is not None:
+                        copy_stream.wait_stream(torch.cuda.current_stream())
+                        with torch.cuda.stream(copy_stream):
+                            target_host = torch.empty(
+                                target_gpu.shape, dtype=target_gpu.dtype, pin_memory=True
+                            )
+                            residual_host = torch.empty(
+                                residual_gpu.shape, dtype=residual_gpu.dtype, pin_memory=True
+                            )
+                            target_host.copy_(target_gpu, non_blocking=True)
+                            residual_host.copy_(residual_gpu, non_blocking=True)
+                            copy_done = torch.cuda.Event()
+                            copy_done.record(copy_stream)
+
+                        # Keep the allocator from reusing the GPU blocks
+                        # before the side-stream copies finish
+                        target_gpu.record_stream(copy_stream)
+                        residual_gpu.record_stream(copy_stream)
+                        pending_copies.append((copy_done, target_host, residual_host))
+                    else:
+                        out_target.append(target_gpu.cpu())
+                        out_residual.append(residual_gpu.cpu())
+
+                # Drop references every group so the caching allocator can
+                # reuse the blocks; only release to the driver periodically
                 del batch, result
-                if torch.cuda.is_available():
+                groups_done += 1
+                if torch.cuda.is_available() and groups_done % EMPTY_CACHE_EVERY == 0:
                     torch.cuda.empty_cache()
+
+                group_start += len(group)
+
+            # Drain the in-flight D2H copies in order
+            for copy_done, target_host, residual_host in pending_copies:
+                copy_done.synchronize()
+                out_target.append(target_host)
+                out_residual.append(residual_host)
             
-            # Concatenate all chunks
-            target_audio = torch.cat(out_target, dim=-1).clamp(-1, 1).float().unsqueeze(0)
-            residual_audio = torch.cat(out_residual, dim=-1).clamp(-1, 1).float().unsqueeze(0)
+            # Concatenate all chunks - already int16 PCM, so no host-side
+            # clamp/float pass over the full-length signal
+            target_audio = torch.cat(out_target, dim=-1).unsqueeze(0)
+            residual_audio = torch.cat(out_residual, dim=-1).unsqueeze(0)
             
             del out_target, out_residual, chunks, audio_tensor
             
         else:
-            print(f"[DEBUG] Audio is {audio_duration:.1f}s, processing as single batch")
+            logger.debug("Audio is %.1fs, processing as single batch", audio_duration)
             
             update_progress(50, "Running separation...")
-            
-            # Process entire audio at once
+
+            # Process entire audio at once - feed the already-decoded tensor;
+            # passing the path would make the processor re-decode the file.
+            # Pad up to the fixed chunk length: the compiled model.separate
+            # (reduce-overhead, dynamic=False) treats every distinct input
+            # length as a new static shape - a full recompile and a separate
+            # CUDA-graph pool per short-file duration, until dynamo's cache
+            # limit drops it to eager. The padding is trimmed from outputs.
+            valid_samples = audio.shape[1]
+            audio_tensor = audio.squeeze(0).to(device, dtype)
+            if valid_samples < MAX_CHUNK_SAMPLES:
+                audio_tensor = torch.nn.functional.pad(
+                    audio_tensor, (0, MAX_CHUNK_SAMPLES - valid_samples)
+                )
             batch = processor(
-                audios=[audio_path],
+                audios=[audio_tensor.unsqueeze(0)],
                 descriptions=[description]
             ).to(device)
-            
+
             # Run separation
             with torch.inference_mode():
                 with torch.cuda.amp.autocast(enabled=(device == "cuda")):
-                    result = model.separate(
-                        batch,
-                        predict_spans=False,
-                        reranking_candidates=1
-                    )
-            
-            target_audio = result.target[0].float().unsqueeze(0).cpu()
-            residual_audio = result.residual[0].float().unsqueeze(0).cpu()
+                    with sdpa_flash_context():
+                        result = model.separate(
+                            batch,
+                            predict_spans=False,
+                            reranking_candidates=1
+                        )
+
+            target_audio = to_int16_pcm(result.target[0][:valid_samples]).cpu().unsqueeze(0)
+            residual_audio = to_int16_pcm(result.residual[0][:valid_samples]).cpu().unsqueeze(0)
+
+            del audio_tensor
             
             del batch, result
         
@@ -379,32 +560,42 @@ def separate_audio_task(
         ghost_path = output_base.with_suffix(".ghost.wav")
         clean_path = output_base.with_suffix(".clean.wav")
         
-        # Save original audio
-        torchaudio.save(str(original_path), audio.cpu(), sample_rate)
-        
-        # Save separated audio
-        if mode == "extract":
-            torchaudio.save(str(ghost_path), target_audio, sample_rate)
-            torchaudio.save(str(clean_path), residual_audio, sample_rate)
-        else:
-            torchaudio.save(str(ghost_path), target_audio, sample_rate)
-            torchaudio.save(str(clean_path), residual_audio, sample_rate)
+        # Encode the three WAVs concurrently - torchaudio.save releases
+        # the GIL for the encode, so the files overlap instead of
+        # serializing three disk writes at the end of every task
+        with ThreadPoolExecutor(max_workers=3) as save_pool:
+            save_futures = [
+                save_pool.submit(
+                    export_original, audio_path, original_path, audio, sample_rate
+                ),
+                save_pool.submit(save_wav_int16, ghost_path, target_audio, sample_rate),
+                save_pool.submit(save_wav_int16, clean_path, residual_audio, sample_rate),
+            ]
+            for future in save_futures:
+                future.result()
         
         update_progress(100, "Complete!")
         
         # Aggressive cleanup
-        print(f"[DEBUG] Cleaning up GPU memory...")
         del target_audio, residual_audio, audio
-        
+
         gc.collect()
         cleanup_gpu_memory()
-        
-        if torch.cuda.is_available():
-            print(f"[DEBUG] GPU Memory after cleanup: {torch.cuda.memory_allocated() / 1024**3:.2f} GB")
+
+        # memory_allocated() synchronizes with the device - only query
+        # it when the debug level is actually enabled
+        if torch.cuda.is_available() and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "GPU Memory after cleanup: %.2f GB",
+                torch.cuda.memory_allocated() / 1024**3
+            )
         
         # Calculate processing time
         processing_time = time.time() - start_time
-        print(f"[DEBUG] Processing completed in {processing_time:.2f}s for {audio_duration:.2f}s audio")
+        logger.info(
+            "Processing completed in %.2fs for %.2fs audio",
+            processing_time, audio_duration
+        )
         
         result = {
             "original_path": str(original_path),
@@ -433,6 +624,43 @@ def separate_audio_task(
 
 
 
+@celery_app.task(bind=True)
+def separate_audio_batch_task(self, items: List[dict]):
+    """
+    Process many separations sequentially on one long-lived GPU worker
+
+    Each item is a kwargs dict for separate_audio_task (audio_path,
+    description, plus optional mode/model_size/... and a task_id for
+    per-item result lookup). Items run in-process via .apply() so the
+    cached model is loaded once for the whole batch; between items only
+    the allocator cache is released - the weights stay pinned.
+    """
+    total = len(items)
+    results = []
+
+    for i, item in enumerate(items):
+        update_progress(
+            int((i / total) * 100),
+            f"Processing item {i + 1}/{total}..."
+        )
+
+        item = dict(item)
+        item_task_id = item.pop("task_id", None)
+        res = separate_audio_task.apply(kwargs=item, task_id=item_task_id)
+
+        if res.successful():
+            results.append(res.result)
+        else:
+            results.append({"error": str(res.result)})
+
+        # Release cached blocks between items, keep the model loaded
+        cleanup_gpu_memory()
+
+    update_progress(100, "Batch complete!")
+
+    return {"count": total, "items": results}
+
+
 @celery_app.task(bind=True)
 def match_pattern_task(
     self,
@@ -43,7 +43,8 @@ start "AudioGhost Backend" cmd /k "cd /d %SCRIPT_DIR% && conda activate audiogho
 
 echo [3/4] Starting Celery Worker...
 timeout /t 2 /nobreak >nul
-start "AudioGhost Worker" cmd /k "cd /d %SCRIPT_DIR% && conda activate audioghost && cd backend && celery -A workers.celery_app worker --loglevel=info --pool=solo"
+start "AudioGhost Worker (GPU)" cmd /k "cd /d %SCRIPT_DIR% && conda activate audioghost && cd backend && set AUDIOGHOST_PRELOAD_MODEL=1&& celery -A workers.celery_app worker -Q gpu --loglevel=info --pool=solo"
+start "AudioGhost Worker (IO)" cmd /k "cd /d %SCRIPT_DIR% && conda activate audioghost && cd backend && celery -A workers.celery_app worker -Q io --loglevel=info --pool=threads --concurrency=8 --prefetch-multiplier=32"
 
 echo [4/4] Starting Frontend...
 timeout /t 2 /nobreak >nul